@@ -1,87 +1,205 @@
-import json
+import hashlib
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash
+import orjson
+from flask import Flask, Response, render_template, request, redirect, session, url_for, flash
 from opentelemetry import trace
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-from pythonjsonlogger import jsonlogger
+from a2wsgi import WSGIMiddleware
+import atexit
+import copy
+import itertools
 import logging
-from threading import Lock
-
-# Global metrics and lock for thread safety
-metrics = {
-    "request_count": 0,
-    "error_count": 0
-}
-metrics_lock = Lock()
+from logging.handlers import QueueHandler
+import queue
+import random
+import stat
+import sys
+import tempfile
+import time
+from threading import RLock, Thread
+
+# Global metrics; next() on itertools.count is atomic under the GIL, so no lock is needed
+_request_counter = itertools.count(1)
+_error_counter = itertools.count(1)
 
 def increment_requests():
-    """Increment the request count in a thread-safe manner."""
-    global metrics
-    with metrics_lock:
-        metrics["request_count"] += 1
-        return metrics["request_count"]
+    """Increment the request count and return the new value."""
+    return next(_request_counter)
 
 def increment_errors():
-    """Increment the error count in a thread-safe manner."""
-    global metrics
-    with metrics_lock:
-        metrics["error_count"] += 1
-        return metrics["error_count"]
+    """Increment the error count and return the new value."""
+    return next(_error_counter)
 
 # Flask App Initialization
 app = Flask(__name__)
 app.secret_key = 'secret'
-COURSE_FILE = 'course_catalog.json'
-
-# Configure structured logging (JSON format)
-log_handler = logging.StreamHandler()  # Output logs to stdout
-formatter = jsonlogger.JsonFormatter('%(asctime)s %(name)s %(levelname)s %(message)s')
-log_handler.setFormatter(formatter)
+COURSE_FILE = 'course_catalog.jsonl'  # One JSON course record per line
+LEGACY_COURSE_FILE = 'course_catalog.json'
+
+# Standard LogRecord attributes; anything else on a record came from `extra`
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+class OrjsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON using orjson."""
+
+    def format(self, record):
+        payload = {
+            "asctime": self.formatTime(record),
+            "name": record.name,
+            "levelname": record.levelname,
+            "message": record.getMessage(),
+        }
+        payload.update((key, value) for key, value in record.__dict__.items()
+                       if key not in _RECORD_ATTRS)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue log records without blocking, dropping them if the queue is full."""
+
+    def prepare(self, record):
+        # Formatting happens on the writer thread; keep exc_info for the formatter
+        return copy.copy(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+def write_log_batch(records):
+    """Format a batch of records and write them to stdout in one call."""
+    lines = []
+    for record in records:
+        try:
+            lines.append((record, formatter.format(record) + "\n"))
+        except Exception:
+            log_handler.handleError(record)  # Report it and keep the rest of the batch
+    try:
+        sys.stdout.write("".join(line for _, line in lines))
+        sys.stdout.flush()
+    except Exception:
+        # E.g. a non-ASCII value on a non-UTF-8 stdout: retry line by line so
+        # only the records that can't be written are lost
+        for record, line in lines:
+            try:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            except Exception:
+                log_handler.handleError(record)
+
+def drain_logs():
+    """Write queued records in batches of up to LOG_BATCH_SIZE or every LOG_FLUSH_INTERVAL."""
+    while True:
+        records = [log_queue.get()]
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        while len(records) < LOG_BATCH_SIZE:
+            try:
+                records.append(log_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        write_log_batch(records)
+
+def flush_logs():
+    """Write any records still queued when the process exits."""
+    records = []
+    while True:
+        try:
+            records.append(log_queue.get_nowait())
+        except queue.Empty:
+            break
+    if records:
+        write_log_batch(records)
+
+# Message of the after_request access log record, whose extras are always
+# exactly method, path, status_code and user_ip
+ACCESS_LOG_MESSAGE = "Request processed"
+
+class FastJsonFormatter(OrjsonFormatter):
+    """Format access log records from their fixed fields, other records generically."""
+
+    def format(self, record):
+        # Identity check: DroppingQueueHandler.prepare keeps the original msg object
+        if record.msg is not ACCESS_LOG_MESSAGE or record.args:
+            return super().format(record)
+        fields = record.__dict__
+        return orjson.dumps({
+            "asctime": self.formatTime(record),
+            "name": record.name,
+            "levelname": record.levelname,
+            "message": ACCESS_LOG_MESSAGE,
+            "method": fields["method"],
+            "path": fields["path"],
+            "status_code": fields["status_code"],
+            "user_ip": fields["user_ip"],
+        }).decode()
+
+# Configure structured logging (JSON format), written off the request path
+LOG_BATCH_SIZE = 256
+LOG_FLUSH_INTERVAL = 0.1  # Seconds
+log_queue = queue.Queue(maxsize=10000)
+log_handler = DroppingQueueHandler(log_queue)  # Output logs to stdout in batches
+formatter = FastJsonFormatter()
+Thread(target=drain_logs, name="log-writer", daemon=True).start()
+atexit.register(flush_logs)
 logger = logging.getLogger(__name__)
 logger.addHandler(log_handler)
 logger.setLevel(logging.INFO)  # Set the log level to INFO
 
-# Configure Jaeger exporter
-jaeger_exporter = JaegerExporter(
-    agent_host_name="localhost",  # Update with the actual Jaeger host if needed
-    agent_port=6831,  # Default Jaeger port
-)
-
-# Add Jaeger exporter to the tracer provider
-tracer_provider = TracerProvider()
-tracer_provider.add_span_processor(BatchSpanProcessor(jaeger_exporter))
-trace.set_tracer_provider(tracer_provider)
-FlaskInstrumentor().instrument_app(app)
-tracer = trace.get_tracer(__name__)
-
-@app.before_request
-def before_request():
-    """Start a span for each request."""
-    request.span = tracer.start_span(
-        f"{request.method} {request.path}",
-        attributes={
-            "http.method": request.method,
-            "http.url": request.url,
-        },
+# Tracing is opt-in: the exporter and Flask instrumentation are only imported
+# and set up when OTEL_ENABLED=1, otherwise the current span is a no-op
+if os.getenv("OTEL_ENABLED") == "1":
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+    from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+
+    # Configure Jaeger exporter
+    jaeger_exporter = JaegerExporter(
+        agent_host_name="localhost",  # Update with the actual Jaeger host if needed
+        agent_port=6831,  # Default Jaeger port
+        udp_split_oversized_batches=True,  # Split batches over the UDP packet limit instead of dropping them
     )
 
+    # Add Jaeger exporter to the tracer provider
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(BatchSpanProcessor(
+        jaeger_exporter,
+        # Tuned for request bursts; override with the standard OTEL_BSP_* variables
+        max_queue_size=int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", 4096)),
+        schedule_delay_millis=int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", 1000)),
+        max_export_batch_size=int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", 256)),
+        export_timeout_millis=int(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", 10000)),
+    ))
+    if os.getenv("OTEL_CONSOLE"):
+        # Development only: print every span to stdout as it ends
+        tracer_provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    trace.set_tracer_provider(tracer_provider)
+    FlaskInstrumentor().instrument_app(app)
+
+# Successful requests to these paths are not logged, here or in their views
+UNLOGGED_PATHS = frozenset({'/', '/catalog'})
+# Fraction of other successful requests that are access-logged
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 0.1))
+
 @app.after_request
 def after_request(response):
-    """Close the span and log metadata."""
-    request.span.set_attribute("http.status_code", response.status_code)
+    """Annotate the request span and log metadata."""
+    current_span = trace.get_current_span()  # Server span from FlaskInstrumentor
+    current_span.set_attribute("http.status_code", response.status_code)
     current_requests = increment_requests()
-    request.span.set_attribute("requests_count", current_requests)
+    current_span.set_attribute("requests_count", current_requests)
 
     if response.status_code >= 400:
-        request.span.set_attribute("error", True)
-    
-    request.span.end()
-
-    # Log request metadata
-    logger.info("Request processed", extra={
+        current_span.set_attribute("error", True)
+
+    # Log request metadata: always for errors, never for successful hot GETs,
+    # and only a sample of the remaining successful requests
+    if response.status_code < 400 and (
+            request.path in UNLOGGED_PATHS or request.path.startswith('/static/')
+            or random.random() >= ACCESS_LOG_SAMPLE_RATE):
+        return response
+    logger.info(ACCESS_LOG_MESSAGE, extra={
         "method": request.method,
         "path": request.path,
         "status_code": response.status_code,
@@ -89,166 +207,361 @@ def after_request(response):
     })
     return response
 
+# Larger catalogs only record course.count on the catalog span
+MAX_SPAN_COURSE_NAMES = 32
+
+# In-memory course cache. The catalog file is append-only, so the cache tracks
+# the file's inode and how many bytes of it were read ("offset"), and only reads
+# the lines other workers appended since. "stat" is the file's (inode, mtime,
+# size) when the cache last caught up with it, "pending" holds saved courses the
+# writer thread hasn't written yet, "by_code" indexes the first course listed
+# under each code, and "version" is bumped whenever the cached courses change.
+_CACHE = {"ino": None, "offset": 0, "stat": None, "data": [], "pending": [],
+          "by_code": {}, "version": 0}
+_CACHE_LOCK = RLock()
+
+# Courses waiting to be appended to the catalog file by the writer thread
+WRITE_BATCH_SIZE = 64
+WRITE_RETRY_DELAY = 1  # Seconds between attempts after a failed write
+_WRITE_QUEUE = queue.Queue()
+
+# Rendered /catalog page as (cache version, body, etag)
+_RENDER_CACHE = {"entry": None}
+
 # Utility Functions
+def migrate_legacy_catalog():
+    """Convert the legacy JSON array catalog to JSON Lines, once."""
+    if os.path.exists(COURSE_FILE) or not os.path.exists(LEGACY_COURSE_FILE):
+        return
+    with open(LEGACY_COURSE_FILE, 'rb') as file:
+        courses = orjson.loads(file.read())
+    # Write to a per-process temporary file and link it into place, so a crash
+    # never leaves a partial catalog and concurrently starting workers don't collide
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(COURSE_FILE)),
+                                    suffix='.tmp')
+    try:
+        with open(fd, 'wb') as file:
+            file.write(b''.join(orjson.dumps(course) + b'\n' for course in courses))
+        # mkstemp creates the file as 0600; give the catalog the legacy file's permissions
+        os.chmod(tmp_file, stat.S_IMODE(os.stat(LEGACY_COURSE_FILE).st_mode))
+        os.link(tmp_file, COURSE_FILE)
+    except FileExistsError:
+        pass  # Another worker migrated first; keep its file, which may already have new lines
+    finally:
+        os.remove(tmp_file)
+
+def read_courses(start, stop=None):
+    """Parse the complete catalog lines between two byte offsets.
+
+    Returns the courses and the offset just past the last complete line, so a
+    line another worker is still writing is left for the next read. Lines that
+    aren't valid JSON, such as one torn by a failed write, are logged and skipped.
+    """
+    with open(COURSE_FILE, 'rb') as file:
+        file.seek(start)
+        chunk = file.read() if stop is None else file.read(stop - start)
+    end = chunk.rfind(b'\n') + 1
+    courses = []
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            courses.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            logger.warning("Skipping unreadable catalog line", extra={
+                "line": line[:200].decode('utf-8', 'replace'),
+            })
+    return courses, start + end
+
+def cache_courses(courses):
+    """Add courses to the cached list and code index."""
+    _CACHE["data"].extend(courses)
+    for course in courses:
+        _CACHE["by_code"].setdefault(course['code'], course)
+
+def reset_cache(courses):
+    """Replace the cached courses, keeping those still waiting to be written."""
+    _CACHE["data"], _CACHE["by_code"] = [], {}
+    cache_courses(courses + _CACHE["pending"])
+    _CACHE["version"] += 1
+
 def load_courses():
-    """Load courses from the JSON file."""
-    if not os.path.exists(COURSE_FILE):
-        return []  # Return an empty list if the file doesn't exist
-    with open(COURSE_FILE, 'r') as file:
-        return json.load(file)
+    """Load courses, reading only what was appended to the catalog file since the last call."""
+    with _CACHE_LOCK:
+        try:
+            st = os.stat(COURSE_FILE)
+        except FileNotFoundError:
+            if _CACHE["ino"] is not None:
+                # The file was removed; start over from an empty catalog
+                _CACHE["ino"], _CACHE["offset"], _CACHE["stat"] = None, 0, None
+                reset_cache([])
+            return _CACHE["data"]
+        if (st.st_ino, st.st_mtime_ns, st.st_size) == _CACHE["stat"]:
+            return _CACHE["data"]
+        if st.st_ino == _CACHE["ino"] and st.st_size >= _CACHE["offset"]:
+            # Only lines appended since the last read (e.g. by another worker) are new
+            courses, _CACHE["offset"] = read_courses(_CACHE["offset"])
+            if courses:
+                cache_courses(courses)
+                _CACHE["version"] += 1
+        else:
+            # New or replaced file: read it in full
+            courses, _CACHE["offset"] = read_courses(0)
+            _CACHE["ino"] = st.st_ino
+            reset_cache(courses)
+        if _CACHE["offset"] == st.st_size:
+            _CACHE["stat"] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        else:
+            _CACHE["stat"] = None  # More was written since the stat; check again next time
+        return _CACHE["data"]
+
+def append_courses(courses, retry=False):
+    """Append courses to the catalog file, picking up lines other workers added first.
+
+    A retry starts on a new line, in case the failed write left a partial one.
+    """
+    payload = b''.join(orjson.dumps(course) + b'\n' for course in courses)
+    if retry:
+        payload = b'\n' + payload
+    with _CACHE_LOCK:
+        with open(COURSE_FILE, 'ab') as file:
+            file.write(payload)
+            file.flush()
+            end = file.tell()  # Just past our own lines, even if others appended since
+            st = os.fstat(file.fileno())
+        del _CACHE["pending"][:len(courses)]
+        start = end - len(payload)
+        if st.st_ino != _CACHE["ino"] or start < _CACHE["offset"]:
+            # The file was created or replaced since the last read; reload it in full
+            _CACHE["ino"] = _CACHE["stat"] = None
+            load_courses()
+            return
+        if start > _CACHE["offset"]:
+            # Other workers appended lines ahead of ours that this cache hasn't seen
+            others, _ = read_courses(_CACHE["offset"], start)
+            cache_courses(others)
+            _CACHE["version"] += 1
+        _CACHE["offset"] = end
+        _CACHE["stat"] = (st.st_ino, st.st_mtime_ns, st.st_size) if st.st_size == end else None
+
+def write_courses():
+    """Append queued courses to the catalog file in batches until a None arrives.
+
+    Courses that queued up during the previous write are written together. A
+    failed batch is logged and retried, so the thread outlives disk errors.
+    """
+    while True:
+        course = _WRITE_QUEUE.get()
+        batch = []
+        while course is not None:
+            batch.append(course)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                break
+            try:
+                course = _WRITE_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+        retry = False
+        while batch:
+            try:
+                append_courses(batch, retry)
+                batch = []
+            except Exception:
+                logger.exception("Failed to write courses to the catalog", extra={
+                    "course_codes": [failed['code'] for failed in batch],
+                })
+                if course is None:
+                    return  # Shutting down; don't hold up the exit
+                retry = True
+                time.sleep(WRITE_RETRY_DELAY)
+        if course is None:
+            return
+
+def stop_course_writer():
+    """Write any queued courses and stop the writer thread."""
+    _WRITE_QUEUE.put(None)
+    course_writer.join()
 
 def save_courses(data):
-    """Save new course data to the JSON file."""
-    courses = load_courses()  # Load existing courses
-    courses.append(data)  # Append the new course
-    with open(COURSE_FILE, 'w') as file:
-        json.dump(courses, file, indent=4)
+    """Add a new course to the cache and queue it for the catalog file."""
+    with _CACHE_LOCK:
+        cache_courses([data])
+        _CACHE["pending"].append(data)
+        _CACHE["version"] += 1
+        _WRITE_QUEUE.put(data)  # Queued under the lock to keep file order
+
+def get_course(code):
+    """Look up a course by its code, or return None if there is none."""
+    with _CACHE_LOCK:
+        load_courses()  # Refresh the cache if the file has changed
+        return _CACHE["by_code"].get(code)
+
+def catalog_response(courses, version):
+    """Return the rendered catalog page, re-rendering only when the courses changed."""
+    entry = _RENDER_CACHE["entry"]
+    if entry is None or entry[0] != version:
+        body = render_template('course_catalog.html', courses=courses).encode()
+        entry = _RENDER_CACHE["entry"] = (version, body, hashlib.sha1(body).hexdigest())
+    response = Response(entry[1], mimetype='text/html')
+    response.set_etag(entry[2])
+    # Let browsers and proxies cache the page but revalidate it on every use, so
+    # a new course shows up right after the add_courses redirect
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response.make_conditional(request)
+
+migrate_legacy_catalog()
+load_courses()  # Warm the cache; append_courses picks up later outside changes
+course_writer = Thread(target=write_courses, name="course-writer", daemon=True)
+course_writer.start()
+atexit.register(stop_course_writer)
 
 # Routes
 @app.route('/')
 def index():
-    """Render the home page and log the event."""
-    with tracer.start_as_current_span("Rendering Home Page") as current_span:
-        current_requests = increment_requests()
-        current_span.set_attribute("requests_count", current_requests)
-        current_span.set_attribute("http.method", request.method)
-        current_span.set_attribute("user.ip", request.remote_addr)
-        current_span.set_attribute("route", "/")
-
-        logger.info("Successfully rendered the Home Page", extra={
-            "route": "/",
-            "method": request.method,
-            "user_ip": request.remote_addr
-        })
+    """Render the home page."""
+    current_span = trace.get_current_span()
+    current_requests = increment_requests()
+    current_span.set_attribute("requests_count", current_requests)
+    current_span.set_attribute("http.method", request.method)
+    current_span.set_attribute("user.ip", request.remote_addr)
     return render_template('index.html')
 
 @app.route('/catalog')
 def course_catalog():
-    """Render course catalog and log metrics."""
-    with tracer.start_as_current_span("Rendering Course Catalog") as current_span:
-        current_requests = increment_requests()
-        current_span.set_attribute("requests_count", current_requests)
-        current_span.set_attribute("http.method", request.method)
-        current_span.set_attribute("user.ip", request.remote_addr)
-        current_span.set_attribute("route", "/catalog")
+    """Render course catalog and record metrics."""
+    current_span = trace.get_current_span()
+    current_requests = increment_requests()
+    current_span.set_attribute("requests_count", current_requests)
+    current_span.set_attribute("http.method", request.method)
+    current_span.set_attribute("user.ip", request.remote_addr)
 
+    with _CACHE_LOCK:
         courses = load_courses()
-        current_span.set_attribute("course.count", len(courses))
+        version = _CACHE["version"]
+    current_span.set_attribute("course.count", len(courses))
+    if len(courses) <= MAX_SPAN_COURSE_NAMES:
         current_span.set_attribute("course.names", [course['name'] for course in courses])
 
-        logger.info("Successfully rendered the Course Catalog Page", extra={
-            "route": "/catalog",
-            "method": request.method,
-            "user_ip": request.remote_addr
-        })
-    return render_template('course_catalog.html', courses=courses)
+    if '_flashes' in session:
+        # Flashed messages are rendered into the page, so it can't be reused
+        return render_template('course_catalog.html', courses=courses)
+    return catalog_response(courses, version)
 
 @app.route('/add_courses', methods=['GET', 'POST'])
 def add_courses():
     """Add a new course to the catalog."""
-    with tracer.start_as_current_span("Handling form submissions") as current_span:
-        current_requests = increment_requests()
-        current_span.set_attribute("requests_count", current_requests)
-        current_span.set_attribute("http.method", request.method)
-        current_span.set_attribute("user.ip", request.remote_addr)
-        current_span.set_attribute("route", "/add_courses")
-
-        if request.method == 'GET':
-            return render_template('add_courses.html')
-
-        if request.method == 'POST':
-            course_code = request.form.get('course-code')
-            course_name = request.form.get('courseName')
-            instructor = request.form.get('instructor')
-            semester = request.form.get('semester')
-            schedule = request.form.get('schedule')
-            classroom = request.form.get('classroom')
-            prerequisites = request.form.get('prerequisites')
-            grading = request.form.get('grading')
-            description = request.form.get('Description')
-
-            # Validate required fields
-            if not course_code or not course_name or not instructor:
-                missing_fields = []
-                if not course_code:
-                    missing_fields.append("Course Code")
-                if not course_name:
-                    missing_fields.append("Course Name")
-                if not instructor:
-                    missing_fields.append("Instructor")
-
-                error_count = increment_errors()
-                current_span.set_attribute("error_count", error_count)
-
-                logger.error("Missing required fields", extra={
-                    "missing_fields": missing_fields,
-                    "route": "/add_courses",
-                    "method": request.method,
-                    "user_ip": request.remote_addr
-                })
+    current_span = trace.get_current_span()
+    current_requests = increment_requests()
+    current_span.set_attribute("requests_count", current_requests)
+    current_span.set_attribute("http.method", request.method)
+    current_span.set_attribute("user.ip", request.remote_addr)
+
+    if request.method == 'GET':
+        return render_template('add_courses.html')
+
+    if request.method == 'POST':
+        course_code = request.form.get('course-code')
+        course_name = request.form.get('courseName')
+        instructor = request.form.get('instructor')
+        semester = request.form.get('semester')
+        schedule = request.form.get('schedule')
+        classroom = request.form.get('classroom')
+        prerequisites = request.form.get('prerequisites')
+        grading = request.form.get('grading')
+        description = request.form.get('Description')
+
+        # Validate required fields
+        if not course_code or not course_name or not instructor:
+            missing_fields = []
+            if not course_code:
+                missing_fields.append("Course Code")
+            if not course_name:
+                missing_fields.append("Course Name")
+            if not instructor:
+                missing_fields.append("Instructor")
+
+            error_count = increment_errors()
+            current_span.set_attribute("error_count", error_count)
 
-                flash(f"Error: Missing required fields: {', '.join(missing_fields)}", "error")
-                return redirect(url_for('course_catalog'))
-
-            # Create course dictionary
-            course = {
-                "code": course_code,
-                "name": course_name,
-                "instructor": instructor,
-                "semester": semester,
-                "schedule": schedule,
-                "classroom": classroom,
-                "prerequisites": prerequisites,
-                "grading": grading,
-                "Description": description
-            }
-
-            save_courses(course)
-            current_span.set_attribute("course.code", course_code)
-            current_span.set_attribute("course.name", course_name)
-            current_span.set_attribute("course.instructor", instructor)
-
-            logger.info("Course added successfully", extra={
-                "course_code": course_code,
-                "course_name": course_name,
-                "instructor": instructor,
+            logger.error("Missing required fields", extra={
+                "missing_fields": missing_fields,
                 "route": "/add_courses",
                 "method": request.method,
                 "user_ip": request.remote_addr
             })
 
-            flash("Course added successfully!", "success")
+            flash(f"Error: Missing required fields: {', '.join(missing_fields)}", "error")
             return redirect(url_for('course_catalog'))
 
+        # Create course dictionary
+        course = {
+            "code": course_code,
+            "name": course_name,
+            "instructor": instructor,
+            "semester": semester,
+            "schedule": schedule,
+            "classroom": classroom,
+            "prerequisites": prerequisites,
+            "grading": grading,
+            "Description": description
+        }
+
+        save_courses(course)
+        current_span.set_attribute("course.code", course_code)
+        current_span.set_attribute("course.name", course_name)
+        current_span.set_attribute("course.instructor", instructor)
+
+        logger.info("Course added successfully", extra={
+            "course_code": course_code,
+            "course_name": course_name,
+            "instructor": instructor,
+            "route": "/add_courses",
+            "method": request.method,
+            "user_ip": request.remote_addr
+        })
+
+        flash("Course added successfully!", "success")
+        return redirect(url_for('course_catalog'))
+
 @app.route('/course/<code>')
 def course_details(code):
     """Display details for a specific course."""
-    with tracer.start_as_current_span("Rendering Course Details") as current_span:
-        current_requests = increment_requests()
-        current_span.set_attribute("requests_count", current_requests)
-        current_span.set_attribute("http.method", request.method)
-        current_span.set_attribute("user.ip", request.remote_addr)
-        current_span.set_attribute("route", f"/course/{code}")
-        current_span.set_attribute("course.code", code)
-
-        courses = load_courses()
-        course = next((course for course in courses if course['code'] == code), None)
-        if not course:
-            error_count = increment_errors()
-            current_span.set_attribute("error_count", error_count)
-            current_span.set_attribute("error", True)
+    current_span = trace.get_current_span()
+    current_requests = increment_requests()
+    current_span.set_attribute("requests_count", current_requests)
+    current_span.set_attribute("http.method", request.method)
+    current_span.set_attribute("user.ip", request.remote_addr)
+    current_span.set_attribute("course.code", code)
+
+    course = get_course(code)
+    if not course:
+        error_count = increment_errors()
+        current_span.set_attribute("error_count", error_count)
+        current_span.set_attribute("error", True)
+
+        logger.error(f"No course found with code: {code}", extra={
+            "course_code": code,
+            "route": f"/course/{code}",
+            "method": request.method,
+            "user_ip": request.remote_addr
+        })
 
-            logger.error(f"No course found with code: {code}", extra={
-                "course_code": code,
-                "route": f"/course/{code}",
-                "method": request.method,
-                "user_ip": request.remote_addr
-            })
+        flash(f"No course found with code '{code}'.", "error")
+        return redirect(url_for('course_catalog'))
 
-            flash(f"No course found with code '{code}'.", "error")
-            return redirect(url_for('course_catalog'))
+    return render_template('course_details.html', course=course)
 
-        return render_template('course_details.html', course=course)
+# ASGI entry point so the app can be served by an async server such as Uvicorn.
+# Requests run on a pool of WSGI_THREADS threads per worker process.
+asgi_app = WSGIMiddleware(app, workers=int(os.getenv("WSGI_THREADS", 10)))
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    import uvicorn
+    uvicorn.run(
+        "app:asgi_app",
+        host="127.0.0.1",
+        port=int(os.getenv("PORT", 5000)),
+        workers=os.cpu_count() or 1,
+        loop="auto",  # Uses uvloop when it is installed
+        http="auto",  # Uses httptools when it is installed
+    )
@@ -4,12 +4,13 @@ from flask import Flask, render_template, request, redirect, url_for, flash
 from opentelemetry import trace
 from opentelemetry.instrumentation.flask import FlaskInstrumentor
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
 # Flask App Initialization
 app = Flask(__name__)
 app.secret_key = 'secret'
 COURSE_FILE = 'course_catalog.json'
+tracer = trace.get_tracer(__name__)
 
 
 # Utility Functions
@@ -37,7 +38,7 @@ def index():
 @app.route('/catalog')
 def course_catalog():
     """Render course catalog and handle new course submission."""
-    with trace.get_tracer(__name__).start_as_current_span("Rendering Course Catalog"):
+    with tracer.start_as_current_span("Rendering Course Catalog"):
         # Add trace attributes for the user request
         current_span = trace.get_current_span()
         current_span.set_attribute("http.method", request.method)
@@ -64,7 +65,7 @@ logger = logging.getLogger(__name__)
 @app.route('/add_courses', methods=['GET', 'POST'])
 def add_courses():
     """Add a new course to the catalog."""
-    with trace.get_tracer(__name__).start_as_current_span("Adding New Course"):
+    with tracer.start_as_current_span("Adding New Course"):
         current_span = trace.get_current_span()
         current_span.set_attribute("http.method", request.method)
         current_span.set_attribute("user.ip", request.remote_addr)
@@ -123,7 +124,7 @@ def add_courses():
 @app.route('/course/<code>')
 def course_details(code):
     """Display details for a specific course."""
-    with trace.get_tracer(__name__).start_as_current_span("Viewing Course Details"):
+    with tracer.start_as_current_span("Viewing Course Details"):
         # Add trace attributes for the user request
         current_span = trace.get_current_span()
         current_span.set_attribute("http.method", request.method)